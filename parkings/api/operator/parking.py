@@ -1,20 +1,33 @@
 from django.conf import settings
 from django.db import transaction
-from django.utils.timezone import now
+from django.utils import timezone
 from rest_framework import mixins, permissions, serializers, viewsets
 
-from parkings.models import Address, Operator, Parking
+from parkings.models import Address, Parking
 
 
-class OperatorAPIAddressSerializer(serializers.ModelSerializer):
+def _get_or_create_address(city, postal_code, street):
+    """
+    Get an existing address matching the given values or create a new one.
+
+    Existing addresses are the common case, so a plain lookup is tried first
+    and get_or_create, with its savepoint, is used only when it misses. The
+    unique index on the address fields serves the lookup and makes
+    get_or_create fall back to the concurrently created row on a conflict.
+    """
+    address = Address.objects.filter(city=city, postal_code=postal_code, street=street).first()
+
+    if address is None:
+        address, _ = Address.objects.get_or_create(city=city, postal_code=postal_code, street=street)
+
+    return address
+
+
+class OperatorAPIAddressSerializer(serializers.Serializer):
     city = serializers.CharField(required=True)
     postal_code = serializers.CharField(required=True)
     street = serializers.CharField(required=True)
 
-    class Meta:
-        model = Address
-        fields = ('city', 'postal_code', 'street')
-
 
 class OperatorAPIParkingSerializer(serializers.ModelSerializer):
     address = OperatorAPIAddressSerializer(allow_null=True, required=False)
@@ -24,69 +37,113 @@ class OperatorAPIParkingSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('operator',)
 
-    @transaction.atomic
     def create(self, validated_data):
         address_data = validated_data.pop('address', None)
+        parking = Parking(**validated_data)
+
+        if not address_data:
+            parking.save(force_insert=True)
+            return parking
 
-        if address_data:
-            validated_data['address'], _ = Address.objects.get_or_create(
-                city=address_data['city'],
-                postal_code=address_data['postal_code'],
-                street=address_data['street'],
+        # the address and the parking referring to it are written together
+        with transaction.atomic():
+            parking.address = _get_or_create_address(
+                address_data['city'], address_data['postal_code'], address_data['street']
             )
+            parking.save(force_insert=True)
 
-        return Parking.objects.create(**validated_data)
+        return parking
 
-    @transaction.atomic
     def update(self, instance, validated_data):
         address_data = validated_data.get('address')
 
-        if address_data:
-            validated_data['address'], _ = Address.objects.get_or_create(
-                city=address_data['city'],
-                postal_code=address_data['postal_code'],
-                street=address_data['street'],
+        if address_data and instance.address is not None:
+            current_address = (instance.address.city, instance.address.postal_code, instance.address.street)
+
+            if current_address == (address_data['city'], address_data['postal_code'], address_data['street']):
+                # the address is unchanged, so there is nothing to look up or write for it
+                del validated_data['address']
+                address_data = None
+
+        if not address_data:
+            return self._save_instance(instance, validated_data)
+
+        # the address and the parking referring to it are written together
+        with transaction.atomic():
+            validated_data['address'] = _get_or_create_address(
+                address_data['city'], address_data['postal_code'], address_data['street']
             )
+            return self._save_instance(instance, validated_data)
 
+    def _save_instance(self, instance, validated_data):
         for attr, value in validated_data.items():
             # does not handle many-to-many fields
             setattr(instance, attr, value)
 
-        instance.save()
+        # update only the columns that were changed, auto_now still refreshes modified_at when it is listed
+        instance.save(update_fields=list(validated_data) + ['modified_at'])
         return instance
 
 
+def _get_operator_id(user):
+    """
+    Get id of the operator of the given user or None if the user isn't one.
+
+    ApiKeyAuthentication fetches the operator together with the user, so
+    this normally doesn't hit the database.
+    """
+    operator = getattr(user, 'operator', None)
+    return operator.id if operator is not None else None
+
+
+def _get_editable_cutoff(request):
+    """
+    Get the creation time before which parkings can no longer be modified.
+
+    The cutoff is computed once and memoized on the request.
+    """
+    try:
+        return request._parkings_editable_cutoff
+    except AttributeError:
+        pass
+
+    request._parkings_editable_cutoff = timezone.now() - settings.PARKINGS_TIME_EDITABLE
+    return request._parkings_editable_cutoff
+
+
 class OperatorAPIParkingPermission(permissions.BasePermission):
     def has_permission(self, request, view):
         """
         Allow only operators to create a parking.
         """
         user = request.user
-
-        if not user.is_authenticated():
-            return False
-
-        try:
-            user.operator
-            return True
-        except Operator.DoesNotExist:
-            pass
-
-        return False
+        return bool(user.is_authenticated) and _get_operator_id(user) is not None
 
     def has_object_permission(self, request, view, obj):
         """
         Allow only operators to modify and only their own parkings and
         only for a fixed period of time after creation.
         """
-        return request.user.operator == obj.operator and (now() - obj.created_at) <= settings.PARKINGS_TIME_EDITABLE
+        operator_id = _get_operator_id(request.user)
+        return (
+            operator_id is not None and
+            obj.operator_id == operator_id and
+            obj.created_at >= _get_editable_cutoff(request)
+        )
 
 
 class OperatorAPIParkingViewSet(mixins.CreateModelMixin, mixins.UpdateModelMixin, mixins.DestroyModelMixin,
                                 viewsets.GenericViewSet):
-    queryset = Parking.objects.all()
+    queryset = Parking.objects.select_related('address')
     serializer_class = OperatorAPIParkingSerializer
     permission_classes = (OperatorAPIParkingPermission,)
 
+    def get_queryset(self):
+        if self.action == 'destroy':
+            # deleting needs only what the permission check looks at
+            return Parking.objects.only('id', 'operator', 'created_at')
+
+        return super().get_queryset()
+
     def perform_create(self, serializer):
-        serializer.save(operator=self.request.user.operator)
+        serializer.save(operator_id=_get_operator_id(self.request.user))
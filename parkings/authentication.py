@@ -1,5 +1,25 @@
+from django.utils.translation import ugettext_lazy as _
+from rest_framework import exceptions
 from rest_framework.authentication import TokenAuthentication
 
 
 class ApiKeyAuthentication(TokenAuthentication):
     keyword = 'ApiKey'
+
+    def authenticate_credentials(self, key):
+        """
+        Authenticate the key and fetch the user's operator in the same query.
+
+        Operator API permissions check the operator on every request, this
+        way that doesn't need a query of its own.
+        """
+        model = self.get_model()
+        try:
+            token = model.objects.select_related('user__operator').get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (token.user, token)
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def merge_duplicate_addresses(apps, schema_editor):
+    """
+    Point parkings of duplicate addresses to the oldest one and delete the rest.
+    """
+    Address = apps.get_model('parkings', 'Address')
+    Parking = apps.get_model('parkings', 'Parking')
+
+    duplicates = Address.objects.values('city', 'postal_code', 'street').annotate(
+        address_count=models.Count('id')
+    ).filter(address_count__gt=1)
+
+    for duplicate in duplicates:
+        del duplicate['address_count']
+        kept, *others = Address.objects.filter(**duplicate).order_by('created_at')
+        Parking.objects.filter(address__in=others).update(address=kept)
+        Address.objects.filter(pk__in=[address.pk for address in others]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parkings', '0002_translatable_verbose_names'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_addresses, migrations.RunPython.noop),
+    ]
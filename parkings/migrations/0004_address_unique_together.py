@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parkings', '0003_merge_duplicate_addresses'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='address',
+            unique_together=set([('city', 'postal_code', 'street')]),
+        ),
+    ]
@@ -12,6 +12,7 @@ class Address(TimestampedModelMixin, UUIDPrimaryKeyMixin):
     class Meta:
         verbose_name = _("address")
         verbose_name_plural = _("addresses")
+        unique_together = (('city', 'postal_code', 'street'),)
 
     def __str__(self):
         return "%s %s %s" % (self.street, self.postal_code, self.city)
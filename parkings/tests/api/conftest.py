@@ -1,22 +1,34 @@
 import datetime
+from collections import namedtuple
 
 import pytest
 from django.utils import timezone
 from rest_framework.test import APIClient
 
+from parkings.models import Parking
+
 from .utils import token_authenticate
 
+Parkings = namedtuple('Parkings', ('past', 'current', 'future'))
+
 
 @pytest.fixture(autouse=True)
-def no_more_mark_django_db(transactional_db):
+def no_more_mark_django_db(db):
     pass
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def api_client():
     return APIClient()
 
 
+@pytest.fixture(autouse=True)
+def clear_api_client_credentials(api_client):
+    # api_client is shared by the whole session, don't let credentials leak from one test to another
+    yield
+    api_client.credentials()
+
+
 @pytest.fixture
 def user_api_client(api_client, user_factory):
     user = user_factory()  # don't use the same user as operator_api_client
@@ -54,27 +66,34 @@ def operator_2_api_client(api_client, operator, operator_2):
 
 
 @pytest.fixture
-def past_parking(parking_factory):
+def three_parkings(parking_factory, operator_factory, address_factory):
+    """
+    Create a past, a current and a future parking with a single INSERT.
+    """
     now = timezone.now()
-    return parking_factory(
-        time_start=now-datetime.timedelta(hours=2),
-        time_end=now-datetime.timedelta(hours=1),
+    hour = datetime.timedelta(hours=1)
+    operator = operator_factory()
+    address = address_factory()
+
+    parkings = Parkings(
+        past=parking_factory.build(operator=operator, address=address, time_start=now-2*hour, time_end=now-hour),
+        current=parking_factory.build(operator=operator, address=address, time_start=now-hour, time_end=now+hour),
+        future=parking_factory.build(operator=operator, address=address, time_start=now+hour, time_end=now+2*hour),
     )
+    Parking.objects.bulk_create(parkings)
+    return parkings
 
 
 @pytest.fixture
-def current_parking(parking_factory):
-    now = timezone.now()
-    return parking_factory(
-        time_start=now-datetime.timedelta(hours=1),
-        time_end=now+datetime.timedelta(hours=1),
-    )
+def past_parking(three_parkings):
+    return three_parkings.past
 
 
 @pytest.fixture
-def future_parking(parking_factory):
-    now = timezone.now()
-    return parking_factory(
-        time_start=now+datetime.timedelta(hours=1),
-        time_end=now+datetime.timedelta(hours=2),
-    )
+def current_parking(three_parkings):
+    return three_parkings.current
+
+
+@pytest.fixture
+def future_parking(three_parkings):
+    return three_parkings.future
@@ -1,10 +1,12 @@
 import datetime
-import json
+from unittest import mock
 
 import pytest
 from django.conf import settings
 from django.core.urlresolvers import reverse
-from freezegun import freeze_time
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import utc
 
 from parkings.models import Parking
 
@@ -12,9 +14,18 @@ from ..utils import ALL_METHODS, check_method_status_codes, check_required_field
 
 list_url = reverse('operator:v1:parking-list')
 
+# the pk is the only dynamic part of a detail url, so resolve the url once and just fill in the pk
+_detail_url_prefix, _detail_url_suffix = reverse('operator:v1:parking-detail', kwargs={'pk': 0}).rsplit('0', 1)
+
 
 def get_detail_url(obj):
-    return reverse('operator:v1:parking-detail', kwargs={'pk': obj.pk})
+    return '%s%s%s' % (_detail_url_prefix, obj.pk, _detail_url_suffix)
+
+
+EXPECTED_PARKING_KEYS = frozenset({
+    'id', 'special_code', 'device_identifier', 'zone', 'registration_number', 'time_start', 'time_end',
+    'resident_code', 'address', 'location', 'created_at', 'modified_at', 'operator'
+})
 
 
 @pytest.fixture
@@ -34,18 +45,17 @@ def check_parking_object(parking_data, parking_obj):
     """
 
     # string valued fields should match 1:1
-    for field in {'device_identifier', 'registration_number', 'resident_code', 'special_code', 'zone'}:
-        assert parking_data[field] == getattr(parking_obj, field)
+    fields = ('device_identifier', 'registration_number', 'resident_code', 'special_code', 'zone')
+    assert {field: parking_data[field] for field in fields} == {field: getattr(parking_obj, field) for field in fields}
 
     assert parking_data['time_start'] == parking_obj.time_start.strftime('%Y-%m-%dT%H:%M:%SZ')
     assert parking_data['time_end'] == parking_obj.time_end.strftime('%Y-%m-%dT%H:%M:%SZ')
-    assert parking_data['location'] == json.loads(parking_obj.location.geojson)
+    assert parking_data['location']['type'] == parking_obj.location.geom_type
+    assert tuple(parking_data['location']['coordinates']) == parking_obj.location.coords
 
     if parking_obj.address:
-        address = parking_obj.address
-        assert parking_data['address'] == {
-            'city': address.city, 'postal_code': address.postal_code, 'street': address.street
-        }
+        address_fields = ('city', 'postal_code', 'street')
+        assert parking_data['address'] == {field: getattr(parking_obj.address, field) for field in address_fields}
     else:
         assert parking_data['address'] is None
 
@@ -54,12 +64,9 @@ def check_response_parking_data(posted_parking_data, response_parking_data):
     """
     Check that parking data dict in a response has the right fields and matches the posted one.
     """
-    expected_keys = {'id', 'special_code', 'device_identifier', 'zone', 'registration_number', 'time_start',
-                     'time_end', 'resident_code', 'address', 'location', 'created_at', 'modified_at', 'operator'}
-
     posted_data_keys = set(posted_parking_data)
     returned_data_keys = set(response_parking_data)
-    assert returned_data_keys == expected_keys
+    assert returned_data_keys == EXPECTED_PARKING_KEYS
 
     # assert common fields equal
     for key in returned_data_keys & posted_data_keys:
@@ -101,6 +108,21 @@ def test_post_parking(operator_api_client, operator, new_parking_data):
     assert new_parking.operator == operator
 
 
+def test_post_parking_does_not_refetch_address(operator_api_client, address_factory, new_parking_data):
+    address_factory(**new_parking_data['address'])
+
+    with CaptureQueriesContext(connection) as context:
+        response_parking_data = post(operator_api_client, list_url, new_parking_data)
+
+    # the address looked up for the parking should be reused when rendering the response
+    address_selects = [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT') and '"parkings_address"' in query['sql']
+    ]
+    assert len(address_selects) == 1
+    assert response_parking_data['address'] == new_parking_data['address']
+
+
 def test_put_parking(operator_api_client, parking, new_parking_data):
     detail_url = get_detail_url(parking)
     response_parking_data = put(operator_api_client, detail_url, new_parking_data)
@@ -148,10 +170,13 @@ def test_operator_cannot_be_set(operator_api_client, operator, operator_2, new_p
     assert new_parking.operator == operator
 
     # PATCH
-    patch(operator_api_client, detail_url, {'operator': str(operator_2.id)})
+    response_parking_data = patch(operator_api_client, detail_url, {'operator': str(operator_2.id)})
     new_parking.refresh_from_db()
     assert new_parking.operator == operator
 
+    # the response should reflect the saved parking, not the ignored input
+    assert response_parking_data['operator'] == str(operator.id)
+
 
 def test_cannot_access_other_than_own_parkings(operator_2_api_client, parking, new_parking_data):
     detail_url = get_detail_url(parking)
@@ -161,14 +186,15 @@ def test_cannot_access_other_than_own_parkings(operator_2_api_client, parking, n
 
 
 def test_cannot_modify_parking_after_modify_period(operator_api_client, new_parking_data):
-    start_time = datetime.datetime(2010, 1, 1, 12, 00)
+    start_time = datetime.datetime(2010, 1, 1, 12, 00, tzinfo=utc)
 
-    with freeze_time(start_time):
+    # patch only timezone.now(), which is what both created_at and the permission check use
+    with mock.patch('django.utils.timezone.now', return_value=start_time):
         response_parking_data = post(operator_api_client, list_url, new_parking_data)
 
     new_parking = Parking.objects.get(id=response_parking_data['id'])
     new_parking_data['zone'] = 2  # change a value just for the heck of it, should not really matter
     end_time = start_time + settings.PARKINGS_TIME_EDITABLE + datetime.timedelta(minutes=1)
 
-    with freeze_time(end_time):
+    with mock.patch('django.utils.timezone.now', return_value=end_time):
         put(operator_api_client, get_detail_url(new_parking), new_parking_data, 403)